@@ -0,0 +1,289 @@
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# gmpy2 multiplies and divides huge integers much faster than python ints.
+# the audit gives the same answers without it, but the pure-int fallback is
+# only practical for a few thousand moduli: auditing ~100k 1024-bit moduli
+# in minutes requires gmpy2 (pip install gmpy2).
+try:
+    from gmpy2 import mpz, gcd as _gcd
+except ImportError:
+    mpz = None
+    _gcd = math.gcd
+
+# =============================================================================
+# 1. division of huge python ints
+# =============================================================================
+#
+# cpython divides in quadratic time, which makes the top of the remainder
+# tree the bottleneck. the recursive burnikel-ziegler division below only
+# needs multiplications (karatsuba) and is used when gmpy2 is not installed.
+
+_DIV_LIMIT = 4000
+
+
+def _div2n1n(a, b, n):
+    # divides a (< b * 2^n) by b (n bits)
+    if a.bit_length() - n <= _DIV_LIMIT:
+        return divmod(a, b)
+    pad = n & 1
+    if pad:
+        a <<= 1
+        b <<= 1
+        n += 1
+    half = n >> 1
+    mask = (1 << half) - 1
+    b1, b2 = b >> half, b & mask
+    q1, r = _div3n2n(a >> n, (a >> half) & mask, b, b1, b2, half)
+    q2, r = _div3n2n(r, a & mask, b, b1, b2, half)
+    if pad:
+        r >>= 1
+    return q1 << half | q2, r
+
+
+def _div3n2n(a12, a3, b, b1, b2, n):
+    if a12 >> n == b1:
+        q, r = (1 << n) - 1, a12 - (b1 << n) + b1
+    else:
+        q, r = _div2n1n(a12, b1, n)
+    r = (r << n | a3) - q * b2
+    while r < 0:
+        q -= 1
+        r += b
+    return q, r
+
+
+def _mod(a, b):
+    """a mod b for non-negative python ints, subquadratic for huge operands."""
+    n = b.bit_length()
+    if a.bit_length() - n <= _DIV_LIMIT:
+        return a % b
+    # process a in n-bit digits from the top, carrying the remainder
+    r = 0
+    for shift in range((a.bit_length() - 1) // n * n, -1, -n):
+        r = _div2n1n((r << n) | ((a >> shift) & ((1 << n) - 1)), b, n)[1]
+    return r
+
+
+if mpz is None:
+    mpz = int
+else:
+    def _mod(a, b):
+        return a % b
+
+# =============================================================================
+# 2. product / remainder trees (bernstein)
+# =============================================================================
+
+def product_tree(nums):
+    """levels of the product tree, leaves first and the total product last."""
+    tree = [list(nums)]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([level[i] * level[i + 1] if i + 1 < len(level) else level[i]
+                     for i in range(0, len(level), 2)])
+    return tree
+
+
+def remainder_tree(tree, top):
+    """
+    walks down from 'top' (the product of the whole set, or a remainder of
+    it) and returns top mod x^2 for every leaf x of the tree.
+    """
+    rems = [top]
+    for level in reversed(tree[:-1]):
+        rems = [_mod(rems[i // 2], x * x) for i, x in enumerate(level)]
+    return rems
+
+
+def _leaf_gcds(moduli, rems):
+    # P mod n^2 divided by n is (P / n) mod n, whose gcd with n is the shared part
+    return [int(_gcd(r // n, n)) for r, n in zip(rems, moduli)]
+
+
+def batch_gcd(moduli):
+    """gcd of every modulus with the product of all the others."""
+    if not moduli:
+        return []
+    moduli = [mpz(n) for n in moduli]
+    tree = product_tree(moduli)
+    return _leaf_gcds(moduli, remainder_tree(tree, tree[-1][0]))
+
+
+def _chunk_tree(chunk):
+    # the levels above the leaves go back to the parent and out again with
+    # _chunk_gcds: sending them is linear, rebuilding them means multiplying
+    return product_tree([mpz(n) for n in chunk])[1:]
+
+
+def _chunk_gcds(task):
+    chunk, upper, top = task
+    chunk = [mpz(n) for n in chunk]
+    return _leaf_gcds(chunk, remainder_tree([chunk] + upper, top))
+
+
+def _mul_pair(pair):
+    a, b = pair
+    return a * b
+
+
+def _mod_square(pair):
+    r, x = pair
+    return _mod(r, x * x)
+
+
+def batch_gcd_parallel(moduli, workers=None, chunks=None):
+    """
+    same result as batch_gcd(); the subtrees below the top log2(chunks)
+    levels are built and descended in separate processes (each built only
+    once), and every node of the top levels, which hold the largest
+    numbers, is a pool task as well.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = min(len(moduli), chunks or 4 * workers)
+    if workers == 1 or chunks < 2:
+        return batch_gcd(moduli)
+
+    size = -(-len(moduli) // chunks)
+    parts = [moduli[i:i + size] for i in range(0, len(moduli), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        subtrees = list(pool.map(_chunk_tree, parts))
+        roots = [upper[-1][0] if upper else mpz(part[0]) for part, upper in zip(parts, subtrees)]
+
+        top_tree = [roots]
+        while len(top_tree[-1]) > 1:
+            level = top_tree[-1]
+            products = list(pool.map(_mul_pair, zip(level[0::2], level[1::2])))
+            if len(level) % 2:
+                products.append(level[-1])
+            top_tree.append(products)
+
+        tops = [top_tree[-1][0]]
+        for level in reversed(top_tree[:-1]):
+            tops = list(pool.map(_mod_square, ((tops[i // 2], x) for i, x in enumerate(level))))
+
+        results = pool.map(_chunk_gcds, zip(parts, subtrees, tops))
+        return [g for part in results for g in part]
+
+# =============================================================================
+# 3. audit
+# =============================================================================
+
+def audit(moduli, workers=1):
+    """
+    finds moduli that share a prime with another modulus of the set.
+    returns a list of (index, factor) with 1 < factor < n, or factor == n
+    when the same modulus occurs more than once.
+    """
+    moduli = [int(n) for n in moduli]
+    gcds = batch_gcd(moduli) if workers == 1 else batch_gcd_parallel(moduli, workers)
+    found = {}
+    whole = []
+    for i, (n, g) in enumerate(zip(moduli, gcds)):
+        if g == 1:
+            continue
+        if g == n:
+            # both primes are shared (or n is duplicated): compare against
+            # the other flagged moduli one by one, there are only a few
+            whole.append(i)
+        else:
+            found[i] = g
+
+    flagged = sorted(set(found) | set(whole))
+    for i in whole:
+        n = moduli[i]
+        factor = n
+        for j in flagged:
+            if j != i:
+                g = math.gcd(n, moduli[j])
+                if 1 < g < n:
+                    factor = g
+                    break
+        found[i] = factor
+    return sorted(found.items())
+
+
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+def _parse_modulus(field, bare_hex=False):
+    # int() would also take a sign, '_' separators and surrounding spaces
+    digits = field[2:] if field[:2].lower() == "0x" else field
+    if not digits or not set(digits) <= _HEX_DIGITS:
+        raise ValueError("not a number")
+    if field.isdigit() and not bare_hex:
+        n = int(field, 10)
+    else:
+        # 0x-prefixed or bare hex, as printed by rsa_keyring show and by this tool ({n:X})
+        n = int(digits, 16)
+    if n < 4:
+        raise ValueError("too small for an RSA modulus")
+    return n
+
+
+def read_moduli(filename, bare_hex=False):
+    """
+    moduli from a keyring file (see rsa_keyring) or a text file with one
+    modulus per line: decimal, hex with a 0x prefix, or bare hex (any value
+    with a-f digits, or every value when bare_hex is set). 'e n' pairs as
+    printed for GenerateKeyPair public keys take the last number; of
+    'name: value' lines, as printed by rsa_keyring show, only 'n:' is used.
+    returns a list of (label, n); a malformed line (a sign, a stray
+    character, or a value below 4) raises ValueError naming filename:lineno.
+    """
+    with open(filename, "rb") as f:
+        head = f.read(8)
+
+    from rsa_keyring import MAGIC, Keyring
+    if head == MAGIC:
+        with Keyring(filename) as ring:
+            return [(f"id {entry.key_id}", entry.n) for entry in ring]
+
+    moduli = []
+    with open(filename, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            fields = line.replace(",", " ").replace("(", " ").replace(")", " ").split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            labelled = fields[0].endswith(":")
+            if labelled and fields[0] != "n:":
+                continue
+            try:
+                n = _parse_modulus(fields[-1], bare_hex or labelled)
+            except ValueError as e:
+                raise ValueError(f"{filename}:{lineno}: cannot parse modulus {fields[-1]!r} ({e})") from None
+            moduli.append((f"line {lineno}", n))
+    return moduli
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="batch-gcd audit for shared RSA primes",
+        epilog="large sets (~100k 1024-bit moduli) need gmpy2 installed to finish in minutes")
+    parser.add_argument("filename", help="keyring file or text file with one modulus per line")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--hex", action="store_true", help="read bare numbers as hex even without a-f digits")
+    args = parser.parse_args(argv)
+
+    try:
+        labelled = read_moduli(args.filename, args.hex)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    result = audit([n for _, n in labelled], args.workers)
+
+    print(f"Checked {len(labelled)} moduli, {len(result)} compromised")
+    for i, factor in result:
+        label, n = labelled[i]
+        if factor == n:
+            print(f"{label}: duplicate modulus {n:X}")
+        else:
+            print(f"{label}: p = {factor:X}")
+            print(f"{' ' * len(label)}  q = {n // factor:X}")
+    return 1 if result else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,159 @@
+import codecs
+import hashlib
+import json
+import os
+from collections import Counter
+from operator import add
+
+from text_norm import RU33, CACHE_DIR, encode_text, decode
+
+VERSION = 1
+HEAD = 400
+
+
+def _bigrams(s, step):
+    # step 1: every overlapping pair, step 2: pairs starting at even positions
+    if step == 1:
+        return Counter(map(add, s, s[1:]))
+    return Counter(map(add, s[0::2], s[1::2]))
+
+
+class CorpusStats:
+    """
+    letter and bigram counts of the crypto_lab1 corpus. the text with spaces
+    is text_norm.encode_text(text, RU33, keep_space=True): RU33 letters, every
+    run of other characters collapsed into one space, no space at either end;
+    the text without spaces is the same with the spaces removed.
+    text can be fed in pieces: the last letter, a pending space and the
+    stream lengths carry the bigrams and the parity of the non-overlapping
+    pairs across the join.
+    """
+
+    def __init__(self):
+        self.offset = 0
+        self.prefix_hash = hashlib.sha256(b"").hexdigest()
+        self.len_with = 0
+        self.len_no = 0
+        self.last = ""
+        self.pending_space = False
+        self.head_with = ""
+        self.head_no = ""
+        self.letters_with = Counter()
+        self.bigrams = {name: Counter() for name in
+                        ("with_overlap", "with_nonoverlap", "no_overlap", "no_nonoverlap")}
+
+    @property
+    def letters_no(self):
+        return Counter({ch: cnt for ch, cnt in self.letters_with.items() if ch != " "})
+
+    def feed(self, text):
+        """adds the next piece of raw corpus text."""
+        if not text:
+            return
+        body = decode(encode_text(text, RU33, keep_space=True), RU33, keep_space=True)
+        if not body:
+            if self.last:
+                self.pending_space = True
+            return
+        if self.last and (self.pending_space or not encode_text(text[0], RU33)):
+            body = " " + body
+        self.pending_space = not encode_text(text[-1], RU33)
+        no = body.replace(" ", "")
+
+        self.letters_with.update(body)
+        self.bigrams["with_overlap"].update(_bigrams(self.last + body, 1))
+        self.bigrams["no_overlap"].update(_bigrams(self.last + no, 1))
+        # an odd stream length means the last letter still waits for its pair
+        self.bigrams["with_nonoverlap"].update(
+            _bigrams(self.last + body if self.len_with % 2 else body, 2))
+        self.bigrams["no_nonoverlap"].update(
+            _bigrams(self.last + no if self.len_no % 2 else no, 2))
+
+        self.len_with += len(body)
+        self.len_no += len(no)
+        self.head_with = (self.head_with + body[:HEAD])[:HEAD]
+        self.head_no = (self.head_no + no[:HEAD])[:HEAD]
+        self.last = body[-1]
+
+    def to_json(self):
+        return {
+            "version": VERSION,
+            "offset": self.offset,
+            "prefix_hash": self.prefix_hash,
+            "len_with": self.len_with,
+            "len_no": self.len_no,
+            "last": self.last,
+            "pending_space": self.pending_space,
+            "head_with": self.head_with,
+            "head_no": self.head_no,
+            "letters_with": self.letters_with,
+            "bigrams": self.bigrams,
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        if data.get("version") != VERSION:
+            raise ValueError("Unsupported stats cache version")
+        stats = cls()
+        for name in ("offset", "prefix_hash", "len_with", "len_no", "last",
+                     "pending_space", "head_with", "head_no"):
+            setattr(stats, name, data[name])
+        stats.letters_with = Counter(data["letters_with"])
+        stats.bigrams = {name: Counter(counts) for name, counts in data["bigrams"].items()}
+        return stats
+
+
+def cache_path_for(filename):
+    directory, base = os.path.split(os.path.abspath(filename))
+    return os.path.join(directory, CACHE_DIR, base + ".stats.json")
+
+
+def _load(cache_file):
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return CorpusStats.from_json(json.load(f))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save(stats, cache_file):
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stats.to_json(), f, ensure_ascii=False)
+    os.replace(tmp_path, cache_file)
+
+
+def update(filename, cache_file=None, rescan=False):
+    """
+    returns CorpusStats for 'filename'. if the cached prefix (offset and
+    sha256 of the bytes before it) still matches the file, only the bytes
+    appended since then are counted and merged; otherwise the whole file
+    is rescanned. the cache is written back when anything changed.
+    """
+    cache_file = cache_file or cache_path_for(filename)
+    with open(filename, "rb") as f:
+        raw = f.read()
+
+    stats = None if rescan else _load(cache_file)
+    if stats is not None and (stats.offset > len(raw)
+                              or hashlib.sha256(raw[:stats.offset]).hexdigest() != stats.prefix_hash):
+        stats = None
+    dirty = stats is None
+    if stats is None:
+        stats = CorpusStats()
+
+    new = raw[stats.offset:]
+    # an incomplete utf-8 sequence at the end stays unprocessed until it is finished
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    text = decoder.decode(new, final=False)
+    consumed = len(new) - len(decoder.getstate()[0])
+    if consumed:
+        stats.feed(text)
+        stats.offset += consumed
+        stats.prefix_hash = hashlib.sha256(raw[:stats.offset]).hexdigest()
+        dirty = True
+
+    if dirty:
+        _save(stats, cache_file)
+    return stats
@@ -1,6 +1,9 @@
 # crypto_lab4_verify.py
+import os
+import sys
+
 import requests
-from my_rsa import GenerateKeyPair, generate_two_prime_pairs, Encrypt, Decrypt, Sign, Verify, SendKey, ReceiveKey 
+from my_rsa import GenerateKeyPair, generate_two_prime_pairs, Encrypt, Decrypt, Sign, Verify, SendKey, ReceiveKey, private_modulus
 
 BASE_URL = "http://asymcryptwebservice.appspot.com/rsa"
 session = requests.Session()
@@ -167,7 +170,7 @@ def test_protocol_send(my_priv_key, server_pub_key):
 
     # send to server
     # parameters: key (k1), signature (s1), modulus (sender), publicexponent (sender)
-    (_, n_sender) = (0, my_priv_key[1]*my_priv_key[2]) # sender modulus
+    n_sender = private_modulus(my_priv_key) # sender modulus
 
     # use standard public exponent
     e_sender = 65537
@@ -227,14 +230,26 @@ if __name__ == "__main__":
         print(f"Failed to reach server: {e}")
         exit(1)
         
-    # 2. generate our keys
+    # 2. generate our keys (or reuse them from a keyring given on the command line)
     # important: our modulus (n) should be <= server modulus (n1) for the sendkey protocol.
     # since the server provides a 512-bit key, we will generate approximately the same size.
-    print("Generating local keys (approx 512 bit modulus)...")
-    (p, q), _ = generate_two_prime_pairs(bits=256) # 256*2 = 512 bit modulus
-    
-    my_pub_key, my_priv_key = GenerateKeyPair(p, q)
-    print(f"Local Key generated. Modulus length: {my_pub_key[1].bit_length()} bits")
+    keyring_file = sys.argv[1] if len(sys.argv) > 1 else None
+    if keyring_file and os.path.exists(keyring_file):
+        from rsa_keyring import Keyring
+        with Keyring(keyring_file) as ring:
+            entry = ring.record(0)
+        my_pub_key, my_priv_key = entry.public_key, entry.private_key
+        print(f"Local Key loaded from {keyring_file}. Modulus length: {my_pub_key[1].bit_length()} bits")
+    else:
+        print("Generating local keys (approx 512 bit modulus)...")
+        (p, q), _ = generate_two_prime_pairs(bits=256) # 256*2 = 512 bit modulus
+
+        my_pub_key, my_priv_key = GenerateKeyPair(p, q)
+        print(f"Local Key generated. Modulus length: {my_pub_key[1].bit_length()} bits")
+        if keyring_file:
+            from rsa_keyring import make_entry, write_keyring
+            write_keyring(keyring_file, [make_entry(1, my_pub_key, my_priv_key)])
+            print(f"Local Key saved to {keyring_file}")
     
     # check n <= n1 condition
     if my_pub_key[1] > server_pub_key[1]:
@@ -0,0 +1,111 @@
+import argparse
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from lab2_task_1_2 import alphabet, m
+from text_norm import UA33, encode_file
+
+# encoded plaintext shared by the worker processes (set by _init_worker)
+_PLAIN = None
+
+
+def column_counts(plain, r):
+    """letter counts of every column plain[i::r], i = 0..r-1."""
+    return [[col.count(c) for c in range(m)] for col in (plain[i::r] for i in range(r))]
+
+
+def ic_for_key(cols, n, key):
+    """
+    ic of the vigenere ciphertext for a key given as letter indices.
+    enciphering column i shifts its histogram by key[i], so the ciphertext
+    counts are built from the plaintext column counts without touching the
+    text itself: the cost is O(r * m) per key regardless of the text length.
+    """
+    shifted = [counts[-k:] + counts[:-k] if k else counts for counts, k in zip(cols, key)]
+    totals = [sum(column) for column in zip(*shifted)]
+    numerator = sum(n_t * (n_t - 1) for n_t in totals)
+    return numerator / (n * (n - 1))
+
+
+def _init_worker(plain):
+    global _PLAIN
+    _PLAIN = plain
+
+
+def _run_length(task):
+    r, trials, seed = task
+    rng = random.Random(seed)
+    cols = column_counts(_PLAIN, r)
+    n = len(_PLAIN)
+    ics = [ic_for_key(cols, n, [rng.randrange(m) for _ in range(r)]) for _ in range(trials)]
+    mean = statistics.fmean(ics)
+    std = statistics.stdev(ics, mean) if trials > 1 else 0.0
+    return r, mean, std
+
+
+def run_experiment(plain, max_len=30, trials=1000, seed=0, workers=None):
+    """
+    enciphers the encoded plaintext with 'trials' random keys for every key
+    length 1..max_len and returns a list of (r, mean_ic, std_ic).
+    """
+    tasks = [(r, trials, seed * 1000003 + r) for r in range(1, max_len + 1)]
+    if workers == 1:
+        _init_worker(plain)
+        return [_run_length(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(plain,)) as pool:
+        return list(pool.map(_run_length, tasks))
+
+
+def plot_results(results, ic_plaintext):
+    import matplotlib.pyplot as plt
+
+    rs = [r for r, _, _ in results]
+    means = [mean for _, mean, _ in results]
+    stds = [std for _, _, std in results]
+
+    plt.figure(figsize=(15, 7))
+    plt.errorbar(rs, means, yerr=stds, fmt="o-", capsize=3, label="шифртекст (середнє ± σ)")
+    plt.axhline(ic_plaintext, color="green", linestyle="--", label="відкритий текст")
+    plt.axhline(1 / m, color="gray", linestyle=":", label="1/m")
+
+    plt.title("Залежність IC від довжини ключа (випадкові ключі)")
+    plt.xlabel("Довжина ключа r")
+    plt.ylabel("Індекс відповідності (IC)")
+    plt.legend()
+
+    plt.show()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="монте-карло оцінка IC для випадкових ключів Віженера")
+    parser.add_argument("filename", nargs="?", default="input_text.txt")
+    parser.add_argument("--max-len", type=int, default=30)
+    parser.add_argument("--trials", type=int, default=1000, help="кількість ключів на кожну довжину")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--plot", action="store_true")
+    args = parser.parse_args(argv)
+    if args.max_len < 1:
+        parser.error("--max-len must be at least 1")
+    if args.trials < 1:
+        parser.error("--trials must be at least 1")
+
+    plain = bytes(encode_file(args.filename, UA33))
+    ic_plaintext = ic_for_key(column_counts(plain, 1), len(plain), [0])
+
+    results = run_experiment(plain, args.max_len, args.trials, args.seed, args.workers)
+
+    print(f"Алфавіт: {len(alphabet)} літер, довжина тексту: {len(plain)}, ключів на довжину: {args.trials}")
+    print(f"IC відкритого тексту: {ic_plaintext:.6f}   1/m = {1 / m:.6f}")
+    print(f"{'r':>3} | {'середній IC':>12} | {'σ':>10}")
+    for r, mean, std in results:
+        print(f"{r:3} | {mean:12.6f} | {std:10.6f}")
+
+    if args.plot:
+        plot_results(results, ic_plaintext)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import argparse
+import math
+from collections import Counter
+
+from text_norm import ALPHABETS, encode_file
+
+# =============================================================================
+# 1. suffix array + lcp
+# =============================================================================
+
+def suffix_array(data):
+    """
+    suffix array of a byte string by prefix doubling: O(n log n) sorts,
+    and usually only a few rounds because ciphertext repeats are short.
+    """
+    n = len(data)
+    sa = list(range(n))
+    rank = list(data)
+    # the first round still ranks by raw letter values, so the base has to
+    # exceed both them and n, or the (rank, next rank) keys collide
+    base = max(n, max(data, default=0) + 1) + 1
+    k = 1
+    while True:
+        key = [rank[i] * base + (rank[i + k] + 1 if i + k < n else 0) for i in range(n)]
+        sa.sort(key=key.__getitem__)
+        new_rank = [0] * n
+        r = 0
+        for j in range(1, n):
+            if key[sa[j]] != key[sa[j - 1]]:
+                r += 1
+            new_rank[sa[j]] = r
+        rank = new_rank
+        if r == n - 1 or k >= n:
+            return sa
+        k *= 2
+
+
+def lcp_array(data, sa):
+    """kasai's algorithm: lcp[j] = common prefix of suffixes sa[j-1] and sa[j]."""
+    n = len(data)
+    rank = [0] * n
+    for j, i in enumerate(sa):
+        rank[i] = j
+    lcp = [0] * n
+    h = 0
+    for i in range(n):
+        j = rank[i]
+        if j == 0:
+            h = 0
+            continue
+        prev = sa[j - 1]
+        while i + h < n and prev + h < n and data[i + h] == data[prev + h]:
+            h += 1
+        lcp[j] = h
+        if h:
+            h -= 1
+    return lcp
+
+# =============================================================================
+# 2. repeats and distances
+# =============================================================================
+
+class RepeatIndex:
+    """suffix array / lcp index over an encoded ciphertext, built once."""
+
+    def __init__(self, data):
+        self.data = bytes(data)
+        self.sa = suffix_array(self.data)
+        self.lcp = lcp_array(self.data, self.sa)
+
+    def repeats(self, min_len=3):
+        """
+        every substring of length min_len that occurs more than once, as
+        (substring, sorted positions). longer repeats show up through their
+        min_len prefix. runs of lcp >= min_len in suffix order are exactly
+        the groups of suffixes that share such a prefix.
+        """
+        result = []
+        sa, lcp = self.sa, self.lcp
+        start = 0
+        for j in range(1, len(sa) + 1):
+            if j < len(sa) and lcp[j] >= min_len:
+                continue
+            if j - start > 1:
+                positions = sorted(sa[start:j])
+                result.append((self.data[positions[0]:positions[0] + min_len], positions))
+            start = j
+        return result
+
+    def distances(self, min_len=3):
+        """distances between consecutive occurrences of every repeat."""
+        return [b - a for _, positions in self.repeats(min_len)
+                for a, b in zip(positions, positions[1:])]
+
+
+def gcd_histogram(repeats):
+    """gcd of all distances of each repeat, counted over the repeats."""
+    hist = Counter()
+    for _, positions in repeats:
+        g = 0
+        for a, b in zip(positions, positions[1:]):
+            g = math.gcd(g, b - a)
+        hist[g] += 1
+    return hist
+
+
+def factor_counts(distances, max_period=30):
+    """number of distances divisible by every r in 2..max_period."""
+    return {r: sum(1 for d in distances if d % r == 0) for r in range(2, max_period + 1)}
+
+# =============================================================================
+# 3. period ranking
+# =============================================================================
+
+def average_ic(data, r, m):
+    """average index of coincidence of the columns data[i::r]."""
+    ics = []
+    for i in range(r):
+        col = data[i::r]
+        n = len(col)
+        if n >= 2:
+            ics.append(sum(c * (c - 1) for c in (col.count(x) for x in range(m))) / (n * (n - 1)))
+    return sum(ics) / len(ics) if ics else 0.0
+
+
+def rank_periods(data, m, max_period=30, min_len=3, index=None, ics=None):
+    """
+    ranks the periods 2..max_period by combining both tests:
+    the share of kasiski distances divisible by r, plus the average column
+    ic scaled so that 1/m gives 0 and the best period gives 1.
+    multiples of the true period keep a high ic but lose kasiski support,
+    so the true period ends up on top.
+    'ics' is an ic sweep already computed by the caller ({r: average ic}
+    for every r in 2..max_period); without it the sweep is done here.
+    returns a list of (score, r, kasiski_share, avg_ic), best first.
+    """
+    if max_period < 2:
+        return []
+    index = index or RepeatIndex(data)
+    data = index.data
+    dists = index.distances(min_len)
+    factors = factor_counts(dists, max_period)
+    if ics is None:
+        ics = {r: average_ic(data, r, m) for r in range(2, max_period + 1)}
+
+    best_ic = max(ics[r] for r in range(2, max_period + 1))
+    spread = best_ic - 1 / m
+    ranking = []
+    for r in range(2, max_period + 1):
+        share = factors[r] / len(dists) if dists else 0.0
+        ic_score = (ics[r] - 1 / m) / spread if spread > 0 else 0.0
+        ranking.append((share + ic_score, r, share, ics[r]))
+    ranking.sort(key=lambda t: (-t[0], t[1]))
+    return ranking
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="метод Казіскі (суфіксний масив) + індекс відповідності")
+    parser.add_argument("filename", nargs="?", default="cypher.txt")
+    parser.add_argument("--alphabet", choices=sorted(ALPHABETS), default="ru32")
+    parser.add_argument("--min-len", type=int, default=3)
+    parser.add_argument("--max-period", type=int, default=30)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+    if args.max_period < 2:
+        parser.error("--max-period must be at least 2")
+
+    alphabet = ALPHABETS[args.alphabet]
+    index = RepeatIndex(encode_file(args.filename, alphabet))
+    repeats = index.repeats(args.min_len)
+
+    print(f"Довжина шифртексту: {len(index.data)}, повторів довжини {args.min_len}: {len(repeats)}")
+    print("Найчастіші НСД відстаней:", gcd_histogram(repeats).most_common(8))
+
+    print(f"\n{'r':>3} | {'оцінка':>7} | {'Казіскі':>7} | {'середній IC':>11}")
+    for score, r, share, ic in rank_periods(index.data, len(alphabet), args.max_period, args.min_len, index)[:args.top]:
+        print(f"{r:3} | {score:7.4f} | {share:7.4f} | {ic:11.6f}")
+
+
+if __name__ == "__main__":
+    main()
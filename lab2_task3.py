@@ -1,13 +1,20 @@
+import argparse
 import collections
 
-alphabet = list("абвгдежзийклмнопрстуфхцчшщъыьэюя")
+from text_norm import RU32, load_text
+
+alphabet = list(RU32)
 m = len(alphabet)
 char_to_index = {ch: i for i, ch in enumerate(alphabet)}
 index_to_char = {i: ch for i, ch in enumerate(alphabet)}
 
-with open("cypher.txt", "r", encoding="utf-8") as f:
-    file_content = f.read()
-    ciphertext = "".join(ch for ch in file_content if ch in alphabet)
+R = 15
+FINAL_KEY_GUESS = "абсолютныйигрок"
+
+
+def load_ciphertext(filename="cypher.txt"):
+    return load_text(filename, RU32)
+
 
 def calculate_ic(text):
     n = len(text)
@@ -17,61 +24,39 @@ def calculate_ic(text):
     return numerator / denominator
 
 
-for r in range(2, 31):
+def average_ic(ciphertext, r):
     columns = [""] * r
     for i, char in enumerate(ciphertext):
         columns[i % r] += char
-        
-    ics_for_this_r = [calculate_ic(col_text) for col_text in columns if len(col_text) >= 2]
-    
-    if ics_for_this_r:
-        avg_ic = sum(ics_for_this_r) / len(ics_for_this_r)
-    else:
-        avg_ic = 0.0
-        
-    print(f"r = {r:2}: Середній IC = {avg_ic:.6f}")
-
-
-R = 15
-print("Аналіз блоків для r = 15")
 
-blocks = [""] * R
-for i, ch in enumerate(ciphertext):
-    blocks[i % R] += ch
+    ics_for_this_r = [calculate_ic(col_text) for col_text in columns if len(col_text) >= 2]
 
-most_common_letters_per_block = []
+    if ics_for_this_r:
+        return sum(ics_for_this_r) / len(ics_for_this_r)
+    return 0.0
 
 
-for i, block in enumerate(blocks):
-    counter = collections.Counter(block)
-    most_common = counter.most_common(4)
-    print(f"\n--- Блок {i} ---")
-    print(f"Довжина блоку: {len(block)}")
-    print(f"Найчастіші літери: {most_common}")
-    most_common_letters_per_block.append(most_common[0][0])
+def split_blocks(ciphertext, r):
+    blocks = [""] * r
+    for i, ch in enumerate(ciphertext):
+        blocks[i % r] += ch
+    return blocks
 
 
-TARGET_CHARS_GUESS = {
-    'о': char_to_index['о'],
-    'е': char_to_index['е'],
-    'а': char_to_index['а']
-}
-found_keys = {}
+def guess_keys(most_common_letters_per_block, guesses=("о", "е", "а")):
+    found_keys = {}
 
-for guess_char, guess_index in TARGET_CHARS_GUESS.items():
-    current_key_chars = []
-    for i in range(R):
-        most_common_char = most_common_letters_per_block[i]
-        c_index = char_to_index[most_common_char]
-        k_index = (c_index - guess_index + m) % m
-        k_char = index_to_char[k_index]
-        current_key_chars.append(k_char)
-        
-    found_keys[guess_char] = "".join(current_key_chars)
+    for guess_char in guesses:
+        guess_index = char_to_index[guess_char]
+        current_key_chars = []
+        for most_common_char in most_common_letters_per_block:
+            c_index = char_to_index[most_common_char]
+            k_index = (c_index - guess_index + m) % m
+            k_char = index_to_char[k_index]
+            current_key_chars.append(k_char)
 
-print(f"\nКлюч (припущення: 'о'): {found_keys['о']}")
-print(f"Ключ (припущення: 'е'): {found_keys['е']}")
-print(f"Ключ (припущення: 'а'): {found_keys['а']}")
+        found_keys[guess_char] = "".join(current_key_chars)
+    return found_keys
 
 
 def vigenere_decrypt(text_to_decrypt, key):
@@ -80,13 +65,59 @@ def vigenere_decrypt(text_to_decrypt, key):
     for i, ch in enumerate(text_to_decrypt):
         c = char_to_index[ch]
         k = char_to_index[key[i % key_len]]
-        p = (c - k + m) % m 
+        p = (c - k + m) % m
         plaintext.append(index_to_char[p])
     return "".join(plaintext)
 
-print("\nДешифрування ключем 'абсолютныйигрок'")
 
-FINAL_KEY_GUESS = "абсолютныйигрок"
-decrypted_text_guess = vigenere_decrypt(ciphertext, FINAL_KEY_GUESS)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="криптоаналіз шифру Віженера")
+    parser.add_argument("filename", nargs="?", default="cypher.txt")
+    parser.add_argument("-r", "--period", type=int, default=R)
+    parser.add_argument("-k", "--key", default=FINAL_KEY_GUESS)
+    parser.add_argument("--kasiski", action="store_true", help="ранжувати періоди методом Казіскі + IC")
+    args = parser.parse_args(argv)
+
+    ciphertext = load_ciphertext(args.filename)
+
+    ics = {}
+    for r in range(2, 31):
+        avg_ic = average_ic(ciphertext, r)
+        ics[r] = avg_ic
+        print(f"r = {r:2}: Середній IC = {avg_ic:.6f}")
+
+    if args.kasiski:
+        from kasiski import rank_periods
+        data = bytes(char_to_index[ch] for ch in ciphertext)
+        print("\nНайкращі періоди (Казіскі + IC):")
+        # the sweep above is reused, only the kasiski distances are new
+        for score, r, share, ic in rank_periods(data, m, max_period=30, ics=ics)[:5]:
+            print(f"r = {r:2}: оцінка = {score:.4f}, Казіскі = {share:.4f}, IC = {ic:.6f}")
+
+    print(f"Аналіз блоків для r = {args.period}")
+
+    most_common_letters_per_block = []
+
+    for i, block in enumerate(split_blocks(ciphertext, args.period)):
+        counter = collections.Counter(block)
+        most_common = counter.most_common(4)
+        print(f"\n--- Блок {i} ---")
+        print(f"Довжина блоку: {len(block)}")
+        print(f"Найчастіші літери: {most_common}")
+        most_common_letters_per_block.append(most_common[0][0])
+
+    found_keys = guess_keys(most_common_letters_per_block)
+
+    print(f"\nКлюч (припущення: 'о'): {found_keys['о']}")
+    print(f"Ключ (припущення: 'е'): {found_keys['е']}")
+    print(f"Ключ (припущення: 'а'): {found_keys['а']}")
+
+    print(f"\nДешифрування ключем '{args.key}'")
+
+    decrypted_text_guess = vigenere_decrypt(ciphertext, args.key)
+
+    print(decrypted_text_guess)
+
 
-print(decrypted_text_guess) 
\ No newline at end of file
+if __name__ == "__main__":
+    main()
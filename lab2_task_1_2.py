@@ -1,6 +1,9 @@
+import argparse
 import collections
-import matplotlib.pyplot as plt
-alphabet = list("абвгґдеєжзиіїйклмнопрстуфхцчшщьюя")
+
+from text_norm import UA33, load_text
+
+alphabet = list(UA33)
 m = len(alphabet)
 char_to_index = {ch: i for i, ch in enumerate(alphabet)}
 index_to_char = {i: ch for i, ch in enumerate(alphabet)}
@@ -22,35 +25,23 @@ keys = {
     19: "технолоджиявоувоуво",
     20: "ліонелямессіроналдуу"
 }
-with open("input_text.txt", "r", encoding="utf-8") as f:
-    text = f.read().lower()
 
-clean_text = "".join(ch for ch in text if ch in alphabet)
 
-print("=== вихідний текст ===")
-print(clean_text)
+def load_clean_text(filename="input_text.txt"):
+    return load_text(filename, UA33)
 
-ic_values_for_plot = []
-labels_for_plot = []
 
 def calculate_ic(text):
     n = len(text)
-    
+
     counts = collections.Counter(text)
-    
+
     numerator = sum(n_t * (n_t - 1) for n_t in counts.values())
-    
+
     denominator = n * (n - 1)
-    
-    return numerator / denominator
 
-ic_plaintext = calculate_ic(clean_text)
-print("====")
-print(f"Індекс відповідності (відкритий текст): {ic_plaintext:.6f}")
-print("====\n")
+    return numerator / denominator
 
-ic_values_for_plot.append(ic_plaintext)
-labels_for_plot.append("Відкритий\nтекст")
 
 def vigenere_encrypt(plaintext, key):
     ciphertext = []
@@ -62,28 +53,63 @@ def vigenere_encrypt(plaintext, key):
         ciphertext.append(index_to_char[c])
     return "".join(ciphertext)
 
-for r, key in keys.items():
-    cipher = vigenere_encrypt(clean_text, key)
-    
-    print(f"=== r={r}, ключ='{key}' ===")
-    print(cipher)
-    
-    ic_cipher = calculate_ic(cipher)
+
+def plot_ic(labels_for_plot, ic_values_for_plot):
+    # matplotlib is heavy, so it is only imported when a plot is requested
+    import matplotlib.pyplot as plt
+
+    bar_colors = ['green'] + ['blue'] * (len(labels_for_plot) - 1)
+
+    plt.figure(figsize=(15, 7))
+
+    plt.bar(labels_for_plot, ic_values_for_plot, color=bar_colors)
+
+    plt.title("Порівняння IC відкритого тексту та шифртекстів")
+    plt.xlabel("Тип тексту (r = довжина ключа)")
+    plt.ylabel("Індекс відповідності (IC)")
+
+    plt.show()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="шифр Віженера та індекс відповідності")
+    parser.add_argument("filename", nargs="?", default="input_text.txt")
+    parser.add_argument("--no-plot", action="store_true", help="не показувати графік")
+    args = parser.parse_args(argv)
+
+    clean_text = load_clean_text(args.filename)
+
+    print("=== вихідний текст ===")
+    print(clean_text)
+
+    ic_values_for_plot = []
+    labels_for_plot = []
+
+    ic_plaintext = calculate_ic(clean_text)
     print("====")
-    print(f"Індекс відповідності (шифротекст r={r}): {ic_cipher:.6f}")
+    print(f"Індекс відповідності (відкритий текст): {ic_plaintext:.6f}")
     print("====\n")
-    
-    ic_values_for_plot.append(ic_cipher)
-    labels_for_plot.append(f"r={r}")
 
-bar_colors = ['green'] + ['blue'] * (len(labels_for_plot) - 1) 
+    ic_values_for_plot.append(ic_plaintext)
+    labels_for_plot.append("Відкритий\nтекст")
+
+    for r, key in keys.items():
+        cipher = vigenere_encrypt(clean_text, key)
+
+        print(f"=== r={r}, ключ='{key}' ===")
+        print(cipher)
+
+        ic_cipher = calculate_ic(cipher)
+        print("====")
+        print(f"Індекс відповідності (шифротекст r={r}): {ic_cipher:.6f}")
+        print("====\n")
 
-plt.figure(figsize=(15, 7)) 
+        ic_values_for_plot.append(ic_cipher)
+        labels_for_plot.append(f"r={r}")
 
-plt.bar(labels_for_plot, ic_values_for_plot, color=bar_colors)
+    if not args.no_plot:
+        plot_ic(labels_for_plot, ic_values_for_plot)
 
-plt.title("Порівняння IC відкритого тексту та шифртекстів")
-plt.xlabel("Тип тексту (r = довжина ключа)")
-plt.ylabel("Індекс відповідності (IC)")
 
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 import collections
 import os
 
-ALPHABET = 'абвгдежзийклмнопрстуфхцчшщьыэюя'
+from text_norm import RU31, FOLD_RU, encode_text, decode, load_text
+
+ALPHABET = RU31
 M = 31
 M_SQ = M * M
 TOP_LANG = ['ст', 'но', 'то', 'на', 'ен']
@@ -26,9 +28,7 @@ def solve_linear_congruence(a, b, m):
     return [x0 + i * (m // g) for i in range(g)]
 
 def clean_text(text):
-    text = text.lower()
-    text = text.replace('ё', 'е').replace('ъ', 'ь')
-    return "".join([c for c in text if c in ALPHABET])
+    return decode(encode_text(text, ALPHABET, FOLD_RU), ALPHABET)
 
 def bigram_to_int(bg):
     return ALPHABET.index(bg[0]) * M + ALPHABET.index(bg[1])
@@ -64,8 +64,7 @@ def main():
         print("Помилка: Файл не знайдено.")
         return
 
-    with open(filename, 'r', encoding='utf-8') as f:
-        cipher_clean = clean_text(f.read())
+    cipher_clean = load_text(filename, ALPHABET, FOLD_RU)
     
     top_cipher = get_top_bigrams_from_text(cipher_clean, 5)
     print(f"\n5 найчастіших біграм шифртексту: {', '.join(top_cipher)}")
@@ -118,6 +118,20 @@ def generate_two_prime_pairs(bits=256):
         if n <= n1:
             return (p, q), (p1, q1)
 
+def generate_multi_prime_key(bits=1024, count=3):
+    """
+    generates a key pair whose modulus (about 'bits' bits) is the product
+    of 'count' primes of bits // count bits each.
+    returns: ((e, n), (d, p1, ..., pk))
+    """
+    while True:
+        primes = [generate_random_prime(bits // count) for _ in range(count)]
+        try:
+            return GenerateMultiPrimeKeyPair(primes)
+        except ValueError:
+            # equal primes or gcd(e, phi) != 1, try again
+            continue
+
 # =============================================================================
 # 3. high-level rsa procedures 
 # =============================================================================
@@ -137,7 +151,78 @@ def GenerateKeyPair(p, q):
         raise ValueError("Invalid 'e' for these primes")
         
     d = modinv(e, phi)
-    return (e, n), (d, p, q)
+    return (e, n), PrivateKey((d, p, q))
+
+def GenerateMultiPrimeKeyPair(primes):
+    """
+    generates rsa keys from two or more distinct primes.
+    the public key keeps the usual (e, n) format; the private key lists all
+    primes after d, so for two primes it is the same (d, p, q) as above.
+    returns: ((e, n), (d, p1, ..., pk))
+    """
+    primes = list(primes)
+    if len(primes) < 2:
+        raise ValueError("At least two primes are required")
+    if len(set(primes)) != len(primes):
+        raise ValueError("Primes must be different")
+    n = math.prod(primes)
+    phi = math.prod(p - 1 for p in primes)
+    e = 65537
+
+    if math.gcd(e, phi) != 1:
+        raise ValueError("Invalid 'e' for these primes")
+
+    d = modinv(e, phi)
+    return (e, n), PrivateKey((d, *primes))
+
+def private_modulus(private_key):
+    """n = product of the primes of a (d, p1, ..., pk) private key."""
+    return math.prod(private_key[1:])
+
+def crt_params(private_key):
+    """
+    per-prime crt values of a (d, p1, ..., pk) private key:
+    [(p, d mod (p - 1), (p1 * ... * p_{i-1})^-1 mod p), ...].
+    """
+    d, *primes = private_key
+    params = []
+    modulus = 1
+    for p in primes:
+        params.append((p, d % (p - 1), modinv(modulus % p, p)))
+        modulus *= p
+    return tuple(params)
+
+class PrivateKey(tuple):
+    """
+    (d, p1, ..., pk) private key that also keeps its crt parameters, so they
+    are derived once per key and not on every decryption. it is an ordinary
+    tuple otherwise; 'crt' may be passed in when the values are already
+    known (see rsa_keyring).
+    """
+    def __new__(cls, values, crt=None):
+        key = super().__new__(cls, values)
+        key.crt = tuple(crt) if crt is not None else crt_params(key)
+        return key
+
+def crt_pow(x, params):
+    """
+    x^d mod n through the chinese remainder theorem from crt_params(): one
+    exponentiation per prime with the exponent reduced mod p - 1, then
+    garner's recombination. every branch works on a modulus k times shorter
+    than n.
+    """
+    result, modulus = 0, 1
+    for p, dp, coeff in params:
+        r = horner_pow(x, dp, p)
+        # lift the result so it is also correct mod p
+        h = ((r - result) * coeff) % p
+        result += h * modulus
+        modulus *= p
+    return result
+
+def _crt(private_key):
+    # a plain (d, p1, ..., pk) tuple has to derive its parameters every time
+    return private_key.crt if isinstance(private_key, PrivateKey) else crt_params(private_key)
 
 def Encrypt(message, public_key):
     """c = m^e mod n"""
@@ -147,16 +232,14 @@ def Encrypt(message, public_key):
     return horner_pow(message, e, n)
 
 def Decrypt(ciphertext, private_key):
-    """m = c^d mod n"""
-    d, p, q = private_key
-    return horner_pow(ciphertext, d, p * q)
+    """m = c^d mod n (crt over the primes of the private key)"""
+    return crt_pow(ciphertext, _crt(private_key))
 
 def Sign(message, private_key):
     """s = m^d mod n (mathematically same as decrypt)"""
-    d, p, q = private_key
-    if not (0 <= message < p * q): 
+    if not (0 <= message < private_modulus(private_key)): 
         raise ValueError("Message too large")
-    return horner_pow(message, d, p * q)
+    return crt_pow(message, _crt(private_key))
 
 def Verify(message, signature, public_key):
     """checks if m == s^e mod n"""
@@ -171,7 +254,7 @@ def SendKey(k, receiver_pub, sender_priv):
     3. encrypt s with their pub -> s1
     """
     # protocol constraint check
-    n_sender = sender_priv[1] * sender_priv[2]
+    n_sender = private_modulus(sender_priv)
     n_receiver = receiver_pub[1]
     if n_sender > n_receiver:
         raise ValueError("Protocol Error: Sender modulus > Receiver modulus")
@@ -0,0 +1,269 @@
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+from my_rsa import GenerateKeyPair, PrivateKey, generate_random_prime, modinv
+
+# =============================================================================
+# 1. file layout
+# =============================================================================
+#
+# header   magic, count, W, P, slots, id table offset, fp table offset
+# records  count x [key_id u64 | e u32 | n W | d W | p P | q P | dp P | dq P | qinv P]
+# id table slots x [hash(key_id) u64 | record + 1 u32]   (open addressing)
+# fp table slots x [fingerprint u64 | record + 1 u32]
+#
+# all integers are big-endian; W is the byte width of the largest modulus,
+# P the byte width of the largest prime. an empty slot has record 0.
+
+MAGIC = b"RSAKR\x00\x01\x00"
+HEADER = struct.Struct(">8sIHHIQQ")
+FIXED = struct.Struct(">QI")
+SLOT = struct.Struct(">QI")
+
+KeyEntry = namedtuple("KeyEntry", "key_id e n d p q dp dq qinv")
+KeyEntry.public_key = property(lambda k: (k.e, k.n))
+# garner over (q, p) needs exactly the stored values: dq, then dp with q^-1 mod p
+KeyEntry.private_key = property(
+    lambda k: PrivateKey((k.d, k.p, k.q), ((k.q, k.dq, 1), (k.p, k.dp, k.qinv))))
+
+
+def fingerprint(n):
+    """first 8 bytes of sha256 over the big-endian modulus, as an int."""
+    raw = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    return int.from_bytes(hashlib.sha256(raw).digest()[:8], "big")
+
+
+def _id_hash(key_id):
+    return int.from_bytes(hashlib.sha256(key_id.to_bytes(8, "big")).digest()[:8], "big")
+
+
+def _width(x):
+    return max(1, (x.bit_length() + 7) // 8)
+
+# =============================================================================
+# 2. writing
+# =============================================================================
+
+def make_entry(key_id, public_key, private_key):
+    """derives n and the crt parameters dp, dq, qinv from a my_rsa key pair."""
+    e, n = public_key
+    if len(private_key) != 3:
+        raise ValueError("Keyring stores two-prime keys only")
+    d, p, q = private_key
+    return KeyEntry(key_id, e, n, d, p, q, d % (p - 1), d % (q - 1), modinv(q, p))
+
+
+def _build_table(keys, slots):
+    table = [(0, 0)] * slots
+    mask = slots - 1
+    for i, h in enumerate(keys):
+        s = h & mask
+        while table[s][1]:
+            s = (s + 1) & mask
+        table[s] = (h, i + 1)
+    return b"".join(SLOT.pack(h, r) for h, r in table)
+
+
+def write_keyring(filename, entries):
+    """
+    writes KeyEntry records (see make_entry) to 'filename'.
+    key ids must be unique and fit into 64 bits, e must fit into 32 bits.
+    the file is written to a temporary name and renamed into place.
+    """
+    entries = list(entries)
+    if len({k.key_id for k in entries}) != len(entries):
+        raise ValueError("Duplicate key id")
+    # validate everything up front so a bad entry never leaves a half-written file
+    for k in entries:
+        if not 0 <= k.key_id < 2 ** 64:
+            raise ValueError("Key id does not fit into 64 bits")
+        if not 0 <= k.e < 2 ** 32:
+            raise ValueError("Public exponent does not fit into 32 bits")
+        if min(k.n, k.d, k.p, k.q, k.dp, k.dq, k.qinv) < 0:
+            raise ValueError("Key values must be non-negative")
+    W = max((_width(max(k.n, k.d)) for k in entries), default=1)
+    P = max((_width(max(k.p, k.q)) for k in entries), default=1)
+
+    # load factor <= 1/2 keeps the probe sequences short
+    slots = 1
+    while slots < 2 * len(entries):
+        slots *= 2
+
+    record_size = FIXED.size + 2 * W + 5 * P
+    id_offset = HEADER.size + len(entries) * record_size
+    fp_offset = id_offset + slots * SLOT.size
+
+    tmp_path = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(entries), W, P, slots, id_offset, fp_offset))
+            for k in entries:
+                f.write(FIXED.pack(k.key_id, k.e))
+                f.write(k.n.to_bytes(W, "big") + k.d.to_bytes(W, "big"))
+                f.write(b"".join(x.to_bytes(P, "big") for x in (k.p, k.q, k.dp, k.dq, k.qinv)))
+            f.write(_build_table([_id_hash(k.key_id) for k in entries], slots))
+            f.write(_build_table([fingerprint(k.n) for k in entries], slots))
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+# =============================================================================
+# 3. reading
+# =============================================================================
+
+class Keyring:
+    """
+    read-only view of a keyring file. the file is memory-mapped and records
+    are decoded only when they are looked up.
+    """
+
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError("Not a keyring file")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.W, self.P, self.slots, self._id_offset, self._fp_offset = \
+            HEADER.unpack_from(self._mm, 0)
+        self._record_size = FIXED.size + 2 * self.W + 5 * self.P
+        # a truncated or foreign file must fail here, not as a short slice in record()
+        if (magic != MAGIC
+                or self._id_offset != HEADER.size + self.count * self._record_size
+                or self._fp_offset != self._id_offset + self.slots * SLOT.size
+                or len(self._mm) != self._fp_offset + self.slots * SLOT.size):
+            self._mm.close()
+            raise ValueError("Not a keyring file")
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mm.close()
+
+    def record(self, i):
+        """i-th record in file order."""
+        if not 0 <= i < self.count:
+            raise IndexError("Record index out of range")
+        mm, W, P = self._mm, self.W, self.P
+        pos = HEADER.size + i * self._record_size
+        key_id, e = FIXED.unpack_from(mm, pos)
+        pos += FIXED.size
+        values = []
+        for width in (W, W, P, P, P, P, P):
+            values.append(int.from_bytes(mm[pos:pos + width], "big"))
+            pos += width
+        return KeyEntry(key_id, e, *values)
+
+    def __iter__(self):
+        return (self.record(i) for i in range(self.count))
+
+    def _probe(self, offset, h):
+        mask = self.slots - 1
+        s = h & mask
+        while True:
+            key, r = SLOT.unpack_from(self._mm, offset + s * SLOT.size)
+            if not r:
+                return
+            if key == h:
+                yield r - 1
+            s = (s + 1) & mask
+
+    def by_id(self, key_id):
+        """record with the given key id, or None."""
+        for i in self._probe(self._id_offset, _id_hash(key_id)):
+            entry = self.record(i)
+            if entry.key_id == key_id:
+                return entry
+        return None
+
+    def by_fingerprint(self, fp):
+        """first record whose modulus has fingerprint 'fp' (int or hex string), or None."""
+        if isinstance(fp, str):
+            fp = int(fp, 16)
+        for i in self._probe(self._fp_offset, fp):
+            return self.record(i)
+        return None
+
+    def by_modulus(self, n):
+        """record with modulus n, or None."""
+        for i in self._probe(self._fp_offset, fingerprint(n)):
+            entry = self.record(i)
+            if entry.n == n:
+                return entry
+        return None
+
+# =============================================================================
+# 4. command line
+# =============================================================================
+
+def generate_entries(count, bits=256, first_id=1):
+    """generates 'count' fresh key pairs with my_rsa and derives their entries."""
+    entries = []
+    while len(entries) < count:
+        p, q = generate_random_prime(bits), generate_random_prime(bits)
+        try:
+            public_key, private_key = GenerateKeyPair(p, q)
+        except ValueError:
+            continue
+        entries.append(make_entry(first_id + len(entries), public_key, private_key))
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="binary RSA keyring")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="generate keys and write a keyring")
+    gen.add_argument("filename")
+    gen.add_argument("--count", type=int, default=100)
+    gen.add_argument("--bits", type=int, default=256, help="bits per prime")
+
+    show = sub.add_parser("show", help="look up a key")
+    show.add_argument("filename")
+    group = show.add_mutually_exclusive_group(required=True)
+    group.add_argument("--id", type=int)
+    group.add_argument("--fingerprint")
+
+    ls = sub.add_parser("list", help="list key ids and fingerprints")
+    ls.add_argument("filename")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        write_keyring(args.filename, generate_entries(args.count, args.bits))
+        print(f"Wrote {args.count} keys to {args.filename}")
+        return 0
+
+    try:
+        ring = Keyring(args.filename)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    if args.command == "show":
+        with ring:
+            entry = ring.by_id(args.id) if args.id is not None else ring.by_fingerprint(args.fingerprint)
+            if entry is None:
+                print("Key not found")
+                return 1
+            for name, value in entry._asdict().items():
+                print(f"{name:>6}: {value:X}" if name != "key_id" else f"{name:>6}: {value}")
+    else:
+        with ring:
+            for entry in ring:
+                print(f"{entry.key_id:8}  {fingerprint(entry.n):016x}  {entry.n.bit_length()} bits")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
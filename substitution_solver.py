@@ -0,0 +1,175 @@
+import argparse
+import csv
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from text_norm import ALPHABETS, FOLDS, encode_file, decode
+
+# the lab1 bigram table is russian, so only the russian alphabets apply
+RU_ALPHABETS = sorted(name for name in ALPHABETS if name.startswith("ru"))
+
+BIGRAMS_CSV = "bigrams_no_overlap.csv"
+
+# =============================================================================
+# 1. statistics
+# =============================================================================
+
+def load_bigram_logprobs(alphabet, fold=None, filename=BIGRAMS_CSV):
+    """
+    reads the overlapping bigram counts written by crypto_lab1 and returns
+    an m x m matrix of log-probabilities over 'alphabet' (add-one smoothing,
+    so bigrams never seen in the corpus are unlikely but not impossible).
+    """
+    fold = fold or {}
+    index = {ch: i for i, ch in enumerate(alphabet)}
+    m = len(alphabet)
+    counts = [[1] * m for _ in range(m)]
+    with open(filename, "r", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for bg, cnt, _ in reader:
+            a, b = fold.get(bg[0], bg[0]), fold.get(bg[1], bg[1])
+            if a in index and b in index:
+                counts[index[a]][index[b]] += int(cnt)
+    total = sum(map(sum, counts))
+    return [[math.log(c / total) for c in row] for row in counts]
+
+
+def bigram_matrix(data, m):
+    """overlapping bigram counts of an index array: C[a][b]."""
+    C = [[0] * m for _ in range(m)]
+    for a, b in zip(data, data[1:]):
+        C[a][b] += 1
+    return C
+
+# =============================================================================
+# 2. scoring
+# =============================================================================
+
+def score(C, L, key):
+    """log-likelihood of the text decrypted with key (cipher letter -> plain letter)."""
+    total = 0.0
+    for a, row in enumerate(C):
+        La = L[key[a]]
+        for b, cnt in enumerate(row):
+            if cnt:
+                total += cnt * La[key[b]]
+    return total
+
+
+def swap_delta(C, CT, L, key, x, y):
+    """
+    score change caused by swapping key[x] and key[y].
+    only rows x, y and columns x, y of the ciphertext bigram matrix see a
+    different plaintext pair, so the text is never decrypted again.
+    CT is the transpose of C.
+    """
+    kx, ky = key[x], key[y]
+    Lx, Ly = L[kx], L[ky]
+    Cx, Cy, CTx, CTy = C[x], C[y], CT[x], CT[y]
+    d = 0.0
+    for b, kb in enumerate(key):
+        if b == x:
+            nb = ky
+        elif b == y:
+            nb = kx
+        else:
+            nb = kb
+            col = CTx[b] - CTy[b]
+            if col:
+                Lb = L[kb]
+                d += col * (Lb[ky] - Lb[kx])
+        if Cx[b]:
+            d += Cx[b] * (Ly[nb] - Lx[kb])
+        if Cy[b]:
+            d += Cy[b] * (Lx[nb] - Ly[kb])
+    return d
+
+# =============================================================================
+# 3. search
+# =============================================================================
+
+def anneal(C, L, iterations=20000, t_start=None, t_end=0.05, rng=random):
+    """
+    simulated annealing over substitution keys starting from a random
+    permutation; the temperature falls geometrically from t_start to t_end.
+    returns (best_score, best_key).
+    """
+    m = len(C)
+    CT = [list(col) for col in zip(*C)]
+    key = list(range(m))
+    rng.shuffle(key)
+    current = score(C, L, key)
+    best, best_key = current, key[:]
+
+    if t_start is None:
+        # scale the temperature with the amount of text
+        t_start = max(1.0, sum(map(sum, C)) / 200)
+    cooling = (t_end / t_start) ** (1 / max(1, iterations - 1))
+    t = t_start
+
+    for _ in range(iterations):
+        x, y = rng.sample(range(m), 2)
+        d = swap_delta(C, CT, L, key, x, y)
+        if d >= 0 or rng.random() < math.exp(d / t):
+            key[x], key[y] = key[y], key[x]
+            current += d
+            if current > best:
+                best, best_key = current, key[:]
+        t *= cooling
+    return best, best_key
+
+
+def _run_restart(task):
+    C, L, iterations, seed = task
+    return anneal(C, L, iterations, rng=random.Random(seed))
+
+
+def solve(data, L, restarts=8, iterations=20000, seed=0, workers=None):
+    """
+    breaks a monoalphabetic substitution over an index array with
+    'restarts' independent annealing runs spread across processes.
+    returns (score, key) of the best run, key[cipher_index] = plain_index.
+    """
+    C = bigram_matrix(data, len(L))
+    tasks = [(C, L, iterations, seed * 1000003 + i) for i in range(restarts)]
+    if workers == 1:
+        results = map(_run_restart, tasks)
+        return max(results)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return max(pool.map(_run_restart, tasks))
+
+
+def decrypt(data, key):
+    """applies the substitution key to an index array."""
+    return bytes(data).translate(bytes(key).ljust(256, b"\0"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="розв'язання шифру простої заміни (відпал за біграмами)")
+    parser.add_argument("filename")
+    parser.add_argument("--alphabet", choices=RU_ALPHABETS, default="ru32")
+    parser.add_argument("--bigrams", default=BIGRAMS_CSV, help="csv з біграмами з crypto_lab1")
+    parser.add_argument("--restarts", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    alphabet, fold = ALPHABETS[args.alphabet], FOLDS.get(args.alphabet)
+    L = load_bigram_logprobs(alphabet, fold, args.bigrams)
+    data = bytes(encode_file(args.filename, alphabet, fold))
+
+    best, key = solve(data, L, args.restarts, args.iterations, args.seed, args.workers)
+
+    print(f"Найкраща оцінка: {best:.2f} ({best / max(1, len(data) - 1):.4f} на біграму)")
+    print("Шифр:  " + alphabet)
+    print("Текст: " + "".join(alphabet[k] for k in key))
+    print("-" * 50)
+    print(decode(decrypt(data, key), alphabet))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import math
+import random
+
+from batch_gcd import _mod, batch_gcd, batch_gcd_parallel
+
+
+def naive_gcds(moduli):
+    return [math.gcd(n, math.prod(moduli[:i] + moduli[i + 1:])) for i, n in enumerate(moduli)]
+
+
+def random_moduli(rng, count):
+    # a small pool of odd "primes" so that some moduli share a factor
+    pool = [rng.getrandbits(64) | 1 for _ in range(count)]
+    return [rng.choice(pool) * rng.choice(pool) for _ in range(count)]
+
+
+def test_mod_matches_builtin():
+    rng = random.Random(0)
+    for _ in range(300):
+        # both below and well above the size where the recursive division starts
+        b = rng.getrandbits(rng.randrange(1, 20000)) | 1
+        a = rng.getrandbits(rng.randrange(0, 60000))
+        assert _mod(a, b) == a % b
+    # divisors with all-ones top halves take the q = 2^n - 1 branch
+    b = (1 << 9000) - 1
+    a = rng.getrandbits(40000)
+    assert _mod(a, b) == a % b
+
+
+def test_batch_gcd_matches_naive():
+    rng = random.Random(1)
+    for count in (1, 2, 3, 7, 16, 33):
+        moduli = random_moduli(rng, count)
+        assert batch_gcd(moduli) == naive_gcds(moduli)
+
+
+def test_parallel_matches_serial():
+    rng = random.Random(2)
+    moduli = random_moduli(rng, 45)
+    expected = naive_gcds(moduli)
+    for chunks in (2, 3, 5):
+        assert batch_gcd_parallel(moduli, workers=2, chunks=chunks) == expected
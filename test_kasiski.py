@@ -0,0 +1,49 @@
+import random
+
+from kasiski import RepeatIndex, lcp_array, suffix_array
+
+
+def naive_lcp(data, sa):
+    lcp = [0] * len(sa)
+    for j in range(1, len(sa)):
+        a, b = data[sa[j - 1]:], data[sa[j]:]
+        h = 0
+        while h < min(len(a), len(b)) and a[h] == b[h]:
+            h += 1
+        lcp[j] = h
+    return lcp
+
+
+def naive_repeats(data, min_len):
+    positions = {}
+    for i in range(len(data) - min_len + 1):
+        positions.setdefault(data[i:i + min_len], []).append(i)
+    return {s: p for s, p in positions.items() if len(p) > 1}
+
+
+def random_inputs(count=2000, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        m = rng.choice((2, 3, 32, 33, 255))
+        yield bytes(rng.randrange(m) for _ in range(rng.randrange(0, 60)))
+
+
+def test_suffix_array_matches_naive():
+    for data in random_inputs():
+        sa = suffix_array(data)
+        assert sa == sorted(range(len(data)), key=lambda i: data[i:])
+        assert lcp_array(data, sa) == naive_lcp(data, sa)
+
+
+def test_short_text_with_large_letter_values():
+    # shorter than the alphabet: raw letter values exceed n
+    data = bytes([0, 0, 28, 31, 28, 1, 31, 2, 31, 1, 0, 30, 30, 31, 1, 0, 1, 31,
+                  29, 1, 0, 1, 1, 29, 2, 0, 29, 31, 29])
+    repeats = dict(RepeatIndex(data).repeats(3))
+    assert repeats[b"\x1f\x01\x00"] == [8, 13]
+
+
+def test_repeats_match_naive():
+    for data in random_inputs(seed=1):
+        for min_len in (1, 2, 3):
+            assert dict(RepeatIndex(data).repeats(min_len)) == naive_repeats(data, min_len)
@@ -0,0 +1,124 @@
+import hashlib
+import mmap
+import os
+
+# =============================================================================
+# 1. alphabets used by the labs
+# =============================================================================
+
+RU32 = "абвгдежзийклмнопрстуфхцчшщъыьэюя"    # lab2_task3
+RU31 = "абвгдежзийклмнопрстуфхцчшщьыэюя"     # lab3 (ё -> е, ъ -> ь)
+RU33 = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"   # crypto_lab1
+UA33 = "абвгґдеєжзиіїйклмнопрстуфхцчшщьюя"   # lab2_task_1_2
+
+ALPHABETS = {"ru31": RU31, "ru32": RU32, "ru33": RU33, "ua33": UA33}
+
+FOLD_RU = {"ё": "е", "ъ": "ь"}
+
+# letters folded when russian text is mapped onto a smaller alphabet
+FOLDS = {"ru31": FOLD_RU, "ru32": {"ё": "е"}}
+
+CACHE_DIR = ".norm_cache"
+
+# =============================================================================
+# 2. translate tables
+# =============================================================================
+
+class _Table(dict):
+    """
+    str.translate table that sends every character it does not know to
+    'default' (None deletes it). the answer is stored on first lookup, so
+    each distinct character goes through python code only once.
+    """
+
+    def __init__(self, mapping, default=None):
+        super().__init__(mapping)
+        self.default = default
+
+    def __missing__(self, key):
+        self[key] = self.default
+        return self.default
+
+
+_tables = {}
+
+def _encode_table(alphabet, fold, keep_space):
+    spec = (alphabet, tuple(sorted((fold or {}).items())), keep_space)
+    table = _tables.get(spec)
+    if table is None:
+        mapping = {}
+        for i, ch in enumerate(alphabet):
+            mapping[ord(ch)] = mapping[ord(ch.upper())] = i
+        for src, dst in (fold or {}).items():
+            i = alphabet.index(dst)
+            mapping[ord(src)] = mapping[ord(src.upper())] = i
+        # the separator gets index len(alphabet), right after the last letter
+        table = _Table(mapping, len(alphabet) if keep_space else None)
+        _tables[spec] = table
+    return table
+
+# =============================================================================
+# 3. encoding / decoding
+# =============================================================================
+
+def encode_text(text, alphabet, fold=None, keep_space=False):
+    """
+    lowercases, folds and filters 'text' in a single str.translate pass and
+    returns bytes holding one letter index per byte.
+    with keep_space=True every run of other characters becomes a single
+    separator with index len(alphabet), and leading/trailing ones are dropped.
+    """
+    s = text.translate(_encode_table(alphabet, fold, keep_space))
+    if keep_space:
+        sep = chr(len(alphabet))
+        s = sep.join(filter(None, s.split(sep)))
+    return s.encode("latin-1")
+
+
+def decode(data, alphabet, keep_space=False):
+    """turns an index array back into a string (separator -> ' ')."""
+    table = {i: ch for i, ch in enumerate(alphabet)}
+    if keep_space:
+        table[len(alphabet)] = " "
+    return bytes(data).decode("latin-1").translate(table)
+
+
+def _spec_hash(alphabet, fold, keep_space):
+    spec = f"{alphabet}|{sorted((fold or {}).items())}|{keep_space}"
+    return hashlib.sha256(spec.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_file(filename, alphabet, fold=None, keep_space=False, cache_dir=None):
+    """
+    encodes a utf-8 text file like encode_text() and caches the result as a
+    raw .u8 file keyed by the source hash and the alphabet spec.
+    returns a read-only mmap of the cached array (len, indexing, slicing and
+    the buffer protocol work; use bytes() for a private copy).
+    repeated calls on an unchanged file only hash it and map the cache.
+    """
+    with open(filename, "rb") as f:
+        raw = f.read()
+
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(filename)), CACHE_DIR)
+    source_hash = hashlib.sha256(raw).hexdigest()[:16]
+    cache_path = os.path.join(cache_dir, f"{source_hash}-{_spec_hash(alphabet, fold, keep_space)}.u8")
+
+    if not os.path.exists(cache_path):
+        data = encode_text(raw.decode("utf-8"), alphabet, fold, keep_space)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+
+    with open(cache_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap cannot map an empty file
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_text(filename, alphabet, fold=None, keep_space=False, cache_dir=None):
+    """normalised text of a file as a string (cached like encode_file)."""
+    return decode(encode_file(filename, alphabet, fold, keep_space, cache_dir), alphabet, keep_space)